@@ -11,6 +11,7 @@ class CountryAdmin(admin.ModelAdmin):
 @admin.register(Blog)
 class BlogAdmin(admin.ModelAdmin):
     list_display = ["title", "author", "created_at"]
+    list_select_related = ["author"]
     list_filter = ["created_at"]
     search_fields = ["title"]
 
@@ -18,6 +19,7 @@ class BlogAdmin(admin.ModelAdmin):
 @admin.register(BlogView)
 class BlogViewAdmin(admin.ModelAdmin):
     list_display = ["blog", "country", "timestamp"]
+    list_select_related = ["blog", "country"]
     list_filter = ["country", "timestamp"]
     date_hierarchy = "timestamp"
 
@@ -25,6 +27,7 @@ class BlogViewAdmin(admin.ModelAdmin):
 @admin.register(DailyAnalyticsSummary)
 class DailyAnalyticsSummaryAdmin(admin.ModelAdmin):
     list_display = ["date", "country", "author", "total_views", "unique_blogs"]
+    list_select_related = ["country", "author"]
     list_filter = ["country", "date"]
     date_hierarchy = "date"
     readonly_fields = ["date", "country", "author", "total_views", "unique_blogs"]
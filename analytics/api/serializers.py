@@ -4,6 +4,7 @@ Analytics API Serializers
 Handles request validation and response formatting for analytics endpoints.
 """
 
+import copy
 from datetime import timedelta
 
 from django.utils import timezone
@@ -11,12 +12,12 @@ from rest_framework import serializers
 
 
 # Constants
-RANGE_CHOICES = ["day", "week", "month", "year"]
-RANGE_DAYS = {
-    "day": 1,
-    "week": 7,
-    "month": 30,
-    "year": 365,
+RANGE_CHOICES = ("day", "week", "month", "year")
+RANGE_DELTAS = {
+    "day": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
 }
 YEAR_MIN = 2000
 YEAR_MAX = 2100
@@ -25,6 +26,11 @@ COUNTRY_CODE_MAX_LENGTH = 5
 
 class AnalyticsFilterSerializer(serializers.Serializer):
 
+    # DRF deep-copies every declared field for each new serializer instance,
+    # rebuilding validators and choice maps on every request. The fields are
+    # stateless, so build them once per class and give each instance shallow
+    # copies (bind() only sets per-instance attributes on the copy).
+    _field_prototypes = None
 
     # Quick date range shortcuts
     range = serializers.ChoiceField(
@@ -74,6 +80,14 @@ class AnalyticsFilterSerializer(serializers.Serializer):
         help_text="Force comparison granularity for performance endpoint: day, week, month, or year",
     )
 
+    def get_fields(self):
+        cls = type(self)
+        if cls.__dict__.get("_field_prototypes") is None:
+            cls._field_prototypes = super().get_fields()
+        return {
+            name: copy.copy(field) for name, field in cls._field_prototypes.items()
+        }
+
     def validate(self, data):
         """
         Convert 'range' shortcut to start_date/end_date.
@@ -96,20 +110,13 @@ class AnalyticsFilterSerializer(serializers.Serializer):
                 }
             )
 
-        # Convert range to dates
-        if "range" in data and data["range"]:
+        # Convert range to dates (ChoiceField has already rejected unknown
+        # values, so the lookup cannot miss)
+        if data.get("range"):
             now = timezone.now()
-            days = RANGE_DAYS.get(data["range"])
-
-            if days is None:
-                raise serializers.ValidationError(
-                    {
-                        "range": f"Invalid range. Must be one of: {', '.join(RANGE_CHOICES)}"
-                    }
-                )
 
             # Override start_date/end_date if range is provided
-            data["start_date"] = now - timedelta(days=days)
+            data["start_date"] = now - RANGE_DELTAS[data["range"]]
             data["end_date"] = now
 
         return data
@@ -119,6 +126,9 @@ class AnalyticsResponseSerializer(serializers.Serializer):
     """
     Standard response format for all analytics endpoints.
 
+    Used for schema documentation only: the services already return plain
+    dicts, which are rendered directly without a serializer pass.
+
     All endpoints return arrays of {x, y, z} objects:
         - x: Grouping key (country code, username, or date)
         - y: Primary metric (number of blogs or total views)
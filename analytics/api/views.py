@@ -7,6 +7,7 @@ Endpoints:
     POST /api/analytics/performance/ - Time-series performance
 """
 
+from django.conf import settings
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -16,7 +17,11 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from drf_yasg.utils import swagger_auto_schema
 
 from analytics.services import AnalyticsService
-from analytics.api.serializers import AnalyticsFilterSerializer
+from analytics.api.renderers import ORJSONRenderer
+from analytics.api.serializers import (
+    AnalyticsFilterSerializer,
+    AnalyticsResponseSerializer,
+)
 
 
 # Constants for validation
@@ -32,10 +37,15 @@ class BaseAnalyticsView(APIView):
     """
 
     authentication_classes = [JWTAuthentication]
-    # Allow toggling API openness via settings for assessment vs production.
-    from django.conf import settings as _settings
+    renderer_classes = [ORJSONRenderer]
+    permission_classes = [AllowAny]
 
-    permission_classes = [AllowAny] if getattr(_settings, "IDEEZA_API_OPEN", True) else [IsAuthenticated]
+    def get_permissions(self):
+        # Allow toggling API openness via settings for assessment vs
+        # production; read per request so settings overrides take effect.
+        if getattr(settings, "IDEEZA_API_OPEN", True):
+            return [AllowAny()]
+        return [IsAuthenticated()]
 
 
 class GroupedAnalyticsView(BaseAnalyticsView):
@@ -56,7 +66,7 @@ class GroupedAnalyticsView(BaseAnalyticsView):
     @swagger_auto_schema(
         operation_description="Group views by country or user (fast - uses pre-calculated data). Requires precalculate_stats to be run first.",
         request_body=AnalyticsFilterSerializer,
-        responses={200: "List of {x, y, z} objects"},
+        responses={200: AnalyticsResponseSerializer(many=True)},
     )
     def post(self, request, object_type):
         if object_type not in VALID_OBJECT_TYPES:
@@ -92,7 +102,7 @@ class TopAnalyticsView(BaseAnalyticsView):
     @swagger_auto_schema(
         operation_description="Get top 10 blogs, users, or countries by views",
         request_body=AnalyticsFilterSerializer,
-        responses={200: "List of {x, y, z} objects (max 10)"},
+        responses={200: AnalyticsResponseSerializer(many=True)},
     )
     def post(self, request, top_type):
         if top_type not in VALID_TOP_TYPES:
@@ -128,7 +138,7 @@ class PerformanceAnalyticsView(BaseAnalyticsView):
     @swagger_auto_schema(
         operation_description="Time-series performance (granularity auto-calculated)",
         request_body=AnalyticsFilterSerializer,
-        responses={200: "List of {x, y, z} objects with growth percentages"},
+        responses={200: AnalyticsResponseSerializer(many=True)},
     )
     def post(self, request):
         serializer = AnalyticsFilterSerializer(data=request.data)
@@ -17,16 +17,22 @@ class Command(BaseCommand):
         num_views = options.get("views", 10)
 
         user, _ = User.objects.get_or_create(username="perf_user")
-        country, _ = Country.objects.get_or_create(name="USA", code="US")
+        country, _ = Country.objects.get_or_create(code="US", defaults={"name": "USA"})
 
-        blogs = []
-        for i in range(num_blogs):
-            b = Blog.objects.create(title=f"Perf Blog {i}", author=user, content="perf")
-            blogs.append(b)
+        blogs = Blog.objects.bulk_create(
+            [
+                Blog(title=f"Perf Blog {i}", author=user, content="perf")
+                for i in range(num_blogs)
+            ]
+        )
 
         now = timezone.now()
-        for i in range(num_views):
-            blog = random.choice(blogs)
-            BlogView.objects.create(blog=blog, country=country, timestamp=now)
+        BlogView.objects.bulk_create(
+            [
+                BlogView(blog=blog, author_id=user.id, country=country, timestamp=now)
+                for blog in random.choices(blogs, k=num_views)
+            ],
+            batch_size=2000,
+        )
 
         self.stdout.write(self.style.SUCCESS(f"Created {num_blogs} blogs and {num_views} views"))
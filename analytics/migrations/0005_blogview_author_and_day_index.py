@@ -0,0 +1,55 @@
+"""
+# Generated by hand: denormalize blog author onto BlogView and add the
+# day/country/author index used by precalculate_stats.
+"""
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+import django.db.models.functions.datetime
+
+
+def backfill_author(apps, schema_editor):
+    Blog = apps.get_model("analytics", "Blog")
+    BlogView = apps.get_model("analytics", "BlogView")
+    BlogView.objects.filter(author__isnull=True).update(
+        author_id=Subquery(
+            Blog.objects.filter(pk=OuterRef("blog_id")).values("author_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("analytics", "0004_add_blog_ids_to_daily_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogview",
+            name="author",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                editable=False,
+                help_text="Author of the viewed blog (denormalized from blog.author)",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="authored_blog_views",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(backfill_author, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="blogview",
+            index=models.Index(
+                django.db.models.functions.datetime.TruncDate("timestamp"),
+                models.F("country"),
+                models.F("author"),
+                models.F("blog"),
+                name="idx_bv_day_country_author",
+            ),
+        ),
+    ]
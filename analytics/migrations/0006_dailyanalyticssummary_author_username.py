@@ -0,0 +1,45 @@
+"""
+# Generated by hand: denormalize the author username onto
+# DailyAnalyticsSummary for join-free "by user" grouping.
+"""
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_author_username(apps, schema_editor):
+    User = apps.get_model("auth", "User")
+    DailyAnalyticsSummary = apps.get_model("analytics", "DailyAnalyticsSummary")
+    DailyAnalyticsSummary.objects.filter(author__isnull=False).update(
+        author_username=Subquery(
+            User.objects.filter(pk=OuterRef("author_id")).values("username")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("analytics", "0005_blogview_author_and_day_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyanalyticssummary",
+            name="author_username",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="Author username at pre-calculation time",
+                max_length=150,
+            ),
+        ),
+        migrations.RunPython(backfill_author_username, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="dailyanalyticssummary",
+            index=models.Index(
+                fields=["date", "author_username"], name="idx_summary_date_username"
+            ),
+        ),
+    ]
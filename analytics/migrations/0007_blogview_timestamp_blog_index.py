@@ -0,0 +1,21 @@
+"""
+# Generated by hand: (timestamp, blog) index on BlogView for time-range
+# aggregations that only touch the blog column.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0006_dailyanalyticssummary_author_username"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogview",
+            index=models.Index(
+                fields=["timestamp", "blog"], name="idx_timestamp_blog"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+"""
+# Generated by hand: keep idx_bv_day_country_author on PostgreSQL only.
+#
+# On SQLite TruncDate compiles to django_datetime_cast_date(), a function
+# registered only on Django's own connections, so the expression index made
+# every INSERT from other clients (sqlite3 CLI, ETL, restores) fail. The
+# index leaves the model state here; PostgreSQL keeps the physical index
+# created by 0005 and every other backend drops it.
+"""
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+DAY_INDEX = models.Index(
+    django.db.models.functions.datetime.TruncDate("timestamp"),
+    models.F("country"),
+    models.F("author"),
+    models.F("blog"),
+    name="idx_bv_day_country_author",
+)
+
+
+def drop_day_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.remove_index(apps.get_model("analytics", "BlogView"), DAY_INDEX)
+
+
+def restore_day_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.add_index(apps.get_model("analytics", "BlogView"), DAY_INDEX)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0007_blogview_timestamp_blog_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="blogview", name="idx_bv_day_country_author"
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_day_index, restore_day_index),
+            ],
+        ),
+    ]
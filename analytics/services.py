@@ -6,15 +6,28 @@ Provides both real-time and pre-calculated query methods.
 """
 
 import hashlib
-import json
 import logging
-from datetime import datetime
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dt_time, timedelta
+from functools import lru_cache
+from typing import Any, ClassVar, List, Dict, Set
 
+import orjson
+
+from django.contrib.auth.models import User
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.cache import cache
-from django.db.models import Count, F, Q, Sum, Min, Max
-from django.db.models.functions import TruncMonth, TruncWeek, TruncDay, TruncYear
+from django.db import connection, connections, transaction
+from django.db.models import Count, F, Q, Min, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import (
+    TruncDate,
+    TruncMonth,
+    TruncWeek,
+    TruncDay,
+    TruncYear,
+)
 from django.conf import settings
+from django.utils import timezone
 
 from .models import BlogView, DailyAnalyticsSummary, Blog
 from django_redis import get_redis_connection
@@ -22,6 +35,93 @@ from django_redis import get_redis_connection
 logger = logging.getLogger(__name__)
 
 
+def _freeze_filters(filters: Dict) -> tuple:
+    """Hashable, order-independent form of a filters dict (lists become tuples)."""
+    return tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in filters.items()
+        )
+    )
+
+
+def _as_date(value):
+    """DailyAnalyticsSummary.date is a DateField: drop the time part if any."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+# Period truncations per granularity. Expressions are copied when a queryset
+# resolves them, so one instance per field can serve every query.
+BLOGVIEW_TRUNCS = {
+    "year": TruncYear("timestamp"),
+    "month": TruncMonth("timestamp"),
+    "week": TruncWeek("timestamp"),
+    "day": TruncDay("timestamp"),
+}
+BLOG_TRUNCS = {
+    "year": TruncYear("created_at"),
+    "month": TruncMonth("created_at"),
+    "week": TruncWeek("created_at"),
+    "day": TruncDay("created_at"),
+}
+
+
+# (filter key, lookup, negate) for the dimension filters of each model.
+# Date filters are handled up front by _build_q since year and start/end
+# are mutually exclusive.
+BLOGVIEW_FILTER_MAP = (
+    ("country_codes", "country__code__in", False),
+    ("exclude_country_codes", "country__code__in", True),
+    # Through the blog: BlogView.author is only guaranteed after precalc has
+    # backfilled it (views written without save() arrive with NULL)
+    ("author_username", "blog__author__username", False),
+    ("blog_id", "blog_id", False),
+)
+SUMMARY_FILTER_MAP = (
+    ("country_codes", "country__code__in", False),
+    ("exclude_country_codes", "country__code__in", True),
+    # Denormalized username, no join
+    ("author_username", "author_username", False),
+)
+
+
+# Q objects are immutable once built, so the same instance can be reused by
+# every queryset that applies an identical filter set (e.g. the three
+# dashboard APIs in one request).
+@lru_cache(maxsize=1024)
+def _build_q(
+    frozen_filters: tuple, date_field: str, filter_map: tuple, dates_only: bool = False
+) -> Q:
+    """
+    Build the Q for a frozen filter set against one model's field table.
+
+    Args:
+        frozen_filters: Output of _freeze_filters()
+        date_field: Field the year/start_date/end_date filters apply to
+        filter_map: (filter key, lookup, negate) rows for the other filters
+        dates_only: Truncate start/end datetimes to dates (DateField target)
+    """
+    filters = dict(frozen_filters)
+    q_objects = Q()
+
+    # Date filters (mutually exclusive: year OR date range)
+    if year := filters.get("year"):
+        q_objects &= Q(**{f"{date_field}__year": year})
+    else:
+        for key, lookup in (("start_date", "gte"), ("end_date", "lte")):
+            if value := filters.get(key):
+                if dates_only:
+                    value = _as_date(value)
+                q_objects &= Q(**{f"{date_field}__{lookup}": value})
+
+    for key, lookup, negate in filter_map:
+        if value := filters.get(key):
+            q = Q(**{lookup: value})
+            q_objects &= ~q if negate else q
+
+    return q_objects
+
+
 class AnalyticsService:
     """
     Service class for analytics operations.
@@ -31,15 +131,25 @@ class AnalyticsService:
         get_top_analytics: Get top 10 by views
         get_performance_analytics: Time-series with growth calculation
         get_grouped_analytics_fast: Pre-calculated version (faster)
+        get_bundle: Several of the above with batched cache access
+        dashboard: The grouped/top/performance set in one bundle
     """
 
     CACHE_TIMEOUT = 60 * 15  # 15 minutes
 
+    # get_bundle api -> (cache key prefix, compute method)
+    _BUNDLE_APIS: ClassVar[Dict[str, tuple]] = {
+        "grouped": ("grouped", "_compute_grouped_analytics"),
+        "top": ("top", "_compute_top_analytics"),
+        "performance": ("perf", "_compute_performance_analytics"),
+    }
+
     @classmethod
     def _generate_cache_key(cls, prefix: str, **kwargs) -> str:
         """Generate deterministic cache key from parameters."""
-        payload = json.dumps(kwargs, sort_keys=True, default=str)
-        return f"analytics:{prefix}:{hashlib.md5(payload.encode()).hexdigest()}"
+        payload = orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS, default=str)
+        digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        return f"analytics:{prefix}:{digest}"
 
     @classmethod
     def _build_blogview_filters(cls, filters: Dict) -> Q:
@@ -55,30 +165,7 @@ class AnalyticsService:
         Instead of complex conditional filtering chains, we build a declarative
         query object that clearly expresses the filtering logic.
         """
-        q_objects = Q()
-
-        # Date filters (mutually exclusive: year OR date range)
-        if year := filters.get("year"):
-            q_objects &= Q(timestamp__year=year)
-        else:
-            if start_date := filters.get("start_date"):
-                q_objects &= Q(timestamp__gte=start_date)
-            if end_date := filters.get("end_date"):
-                q_objects &= Q(timestamp__lte=end_date)
-
-        # Country filters
-        if country_codes := filters.get("country_codes"):
-            q_objects &= Q(country__code__in=country_codes)
-        if exclude_codes := filters.get("exclude_country_codes"):
-            q_objects &= ~Q(country__code__in=exclude_codes)
-
-        # Author and blog filters
-        if author := filters.get("author_username"):
-            q_objects &= Q(blog__author__username=author)
-        if blog_id := filters.get("blog_id"):
-            q_objects &= Q(blog_id=blog_id)
-
-        return q_objects
+        return _build_q(_freeze_filters(filters), "timestamp", BLOGVIEW_FILTER_MAP)
 
     @classmethod
     def _apply_filters(cls, queryset, filters: Dict):
@@ -110,25 +197,31 @@ class AnalyticsService:
             "grouped", type=object_type, filters=filters
         )
 
-        if cached := cache.get(cache_key):
+        # Compare against None so cached empty results count as hits too
+        if (cached := cache.get(cache_key)) is not None:
             return cached
 
-        queryset = BlogView.objects.select_related("blog", "blog__author", "country")
-        queryset = cls._apply_filters(queryset, filters)
+        data = cls._compute_grouped_analytics(object_type, filters)
+        cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def _compute_grouped_analytics(cls, object_type: str, filters: Dict) -> List[Dict]:
+        """Run the API #1 aggregation without touching the cache."""
+        # Aggregations return values() rows, so only the joins implied by the
+        # filter/group lookups are needed; select_related would add the rest.
+        queryset = cls._apply_filters(BlogView.objects.all(), filters)
 
         group_field = (
             "country__code" if object_type == "country" else "blog__author__username"
         )
 
-        data = list(
+        return list(
             queryset.values(x=F(group_field))
             .annotate(y=Count("blog", distinct=True), z=Count("id"))
             .order_by("-z")
         )
 
-        cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
-        return data
-
     @classmethod
     def get_top_analytics(cls, top_type: str, filters: Dict) -> List[Dict]:
         """
@@ -143,11 +236,20 @@ class AnalyticsService:
         """
         cache_key = cls._generate_cache_key("top", type=top_type, filters=filters)
 
-        if cached := cache.get(cache_key):
+        # Compare against None so cached empty results count as hits too
+        if (cached := cache.get(cache_key)) is not None:
             return cached
 
-        queryset = BlogView.objects.select_related("blog", "blog__author", "country")
-        queryset = cls._apply_filters(queryset, filters)
+        data = cls._compute_top_analytics(top_type, filters)
+        cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def _compute_top_analytics(cls, top_type: str, filters: Dict) -> List[Dict]:
+        """Run the API #2 aggregation without touching the cache."""
+        # Aggregations return values() rows, so only the joins implied by the
+        # filter/group lookups are needed; select_related would add the rest.
+        queryset = cls._apply_filters(BlogView.objects.all(), filters)
 
         # Configuration dict: maps top_type to (grouping_field, z_metric)
         # This avoids repetitive if/elif chains and makes it easy to add new types
@@ -159,15 +261,12 @@ class AnalyticsService:
 
         group_field, z_metric = config[top_type]
 
-        data = list(
+        return list(
             queryset.values(x=F(group_field))
             .annotate(y=Count("id"), z=z_metric)
             .order_by("-y")[:10]
         )
 
-        cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
-        return data
-
     @classmethod
     def get_performance_analytics(cls, filters: Dict) -> List[Dict]:
         """
@@ -183,133 +282,201 @@ class AnalyticsService:
         """
         cache_key = cls._generate_cache_key("perf", filters=filters)
 
-        if cached := cache.get(cache_key):
+        # Compare against None so cached empty results count as hits too
+        if (cached := cache.get(cache_key)) is not None:
             return cached
 
-        queryset = BlogView.objects.select_related("blog", "blog__author", "country")
-        queryset = cls._apply_filters(queryset, filters)
-
-        # Check if queryset has data
-        if not queryset.exists():
-            logger.info(
-                "No BlogView data found for performance analytics. Returning empty results."
-            )
-            return []
-
-        # Determine time granularity
-        date_range = queryset.aggregate(min=Min("timestamp"), max=Max("timestamp"))
-        min_date = date_range["min"]
-        max_date = date_range["max"]
-
-        # Handle edge case where min/max might be None
-        if not min_date or not max_date:
-            logger.warning(
-                "Invalid date range in performance analytics. Returning empty results."
-            )
-            return []
-
-        days = (max_date - min_date).days
-
-        # Handle edge case where days is 0 or negative
-        if days <= 0:
-            days = 1  # Default to daily granularity
+        results = cls._compute_performance_analytics(filters)
+        cache.set(cache_key, results, timeout=cls.CACHE_TIMEOUT)
+        return results
 
-        # Allow caller to force granularity via filters['compare']
+    @classmethod
+    def _compute_performance_analytics(cls, filters: Dict) -> List[Dict]:
+        """Run the API #3 time-series queries without touching the cache."""
+        # Aggregations return values() rows, so only the joins implied by the
+        # filter/group lookups are needed; select_related would add the rest.
+        queryset = cls._apply_filters(BlogView.objects.all(), filters)
+
+        # Allow caller to force granularity via filters['compare']; only an
+        # auto-selected granularity needs the Min/Max scan.
         compare = filters.get("compare")
-        gran = None
         if compare:
-            gran = compare
-            if compare == "year":
-                trunc_func = TruncYear("timestamp")
-            elif compare == "month":
-                trunc_func = TruncMonth("timestamp")
-            elif compare == "week":
-                trunc_func = TruncWeek("timestamp")
-            else:
-                trunc_func = TruncDay("timestamp")
+            # Unknown values fall back to daily, as before
+            gran = compare if compare in BLOGVIEW_TRUNCS else "day"
         else:
+            # Determine time granularity. The aggregate doubles as the
+            # existence check: no rows means min is None.
+            date_range = queryset.aggregate(min=Min("timestamp"), max=Max("timestamp"))
+            min_date = date_range["min"]
+            max_date = date_range["max"]
+
+            if min_date is None:
+                logger.info(
+                    "No BlogView data found for performance analytics. Returning empty results."
+                )
+                return []
+
+            days = (max_date - min_date).days
+
             if days > 365:
                 gran = "month"
-                trunc_func = TruncMonth("timestamp")
             elif days > 30:
                 gran = "week"
-                trunc_func = TruncWeek("timestamp")
             else:
                 gran = "day"
-                trunc_func = TruncDay("timestamp")
 
-
-        # Aggregate by period for views
-        views_qs = (
-            queryset.annotate(period=trunc_func)
-            .values("period")
-            .annotate(views=Count("id"))
-            .order_by("period")
-        )
+        trunc_func = BLOGVIEW_TRUNCS[gran]
 
         # Determine which metric to use for the 'x' label count (blogs)
         metric = getattr(settings, "IDEEZA_PERFORMANCE_X_METRIC", "viewed")
 
-        # Build a mapping period -> blogs count depending on metric
-        blogs_by_period = {}
-
         if metric == "created":
+            # Aggregate by period for views
+            views_qs = (
+                queryset.annotate(period=trunc_func)
+                .values("period")
+                .annotate(views=Count("id"))
+                .order_by("period")
+            )
+            views_map = {v["period"]: v["views"] for v in views_qs}
+
+            # With compare set the Min/Max existence check was skipped; no
+            # matching views still means no series, creations or not.
+            if not views_map:
+                logger.info(
+                    "No BlogView data found for performance analytics. Returning empty results."
+                )
+                return []
+
             # Count blog creations during the period. Author filter is respected;
             # country filters are not applicable to Blog.created_at.
             blog_qs = Blog.objects.all()
             if author := filters.get("author_username"):
                 blog_qs = blog_qs.filter(author__username=author)
 
-            # Build a truncation expression that targets Blog.created_at
-            if gran == "year":
-                blog_trunc = TruncYear("created_at")
-            elif gran == "month":
-                blog_trunc = TruncMonth("created_at")
-            elif gran == "week":
-                blog_trunc = TruncWeek("created_at")
-            else:
-                blog_trunc = TruncDay("created_at")
-
+            # Truncation expression that targets Blog.created_at
             created_qs = (
-                blog_qs.annotate(period=blog_trunc)
+                blog_qs.annotate(period=BLOG_TRUNCS[gran])
                 .values("period")
                 .annotate(blogs=Count("id"))
                 .order_by("period")
             )
-
-            for entry in created_qs:
-                blogs_by_period[entry["period"]] = entry["blogs"]
+            blogs_by_period = {entry["period"]: entry["blogs"] for entry in created_qs}
+
+            # Merge periods from views and blogs so we include periods that may
+            # have creations but no views (or vice versa)
+            all_periods = sorted(set(list(views_map.keys()) + list(blogs_by_period.keys())))
+
+            raw_data = []
+            for period in all_periods:
+                raw_data.append(
+                    {
+                        "period": period,
+                        "views": views_map.get(period, 0),
+                        "blogs": blogs_by_period.get(period, 0),
+                    }
+                )
         else:
-            # Default: 'viewed' distinct blogs per period from BlogView
-            viewed_qs = (
+            # Default: 'viewed' distinct blogs per period, counted in the same
+            # GROUP BY as the views so the range is scanned once.
+            raw_data = (
                 queryset.annotate(period=trunc_func)
                 .values("period")
-                .annotate(blogs=Count("blog", distinct=True))
+                .annotate(views=Count("id"), blogs=Count("blog", distinct=True))
                 .order_by("period")
             )
-            for entry in viewed_qs:
-                blogs_by_period[entry["period"]] = entry["blogs"]
-
-        # Merge periods from views and blogs so we include periods that may
-        # have creations but no views (or vice versa)
-        views_map = {v["period"]: v["views"] for v in views_qs}
-        all_periods = sorted(set(list(views_map.keys()) + list(blogs_by_period.keys())))
-
-        raw_data = []
-        for period in all_periods:
-            raw_data.append(
-                {
-                    "period": period,
-                    "views": views_map.get(period, 0),
-                    "blogs": blogs_by_period.get(period, 0),
-                }
-            )
 
         # Calculate growth percentage for each period
-        results = cls._calculate_growth_periods(raw_data)
+        return cls._calculate_growth_periods(raw_data)
 
-        cache.set(cache_key, results, timeout=cls.CACHE_TIMEOUT)
-        return results
+    @classmethod
+    def get_bundle(
+        cls, requests: List[Dict], max_workers: int = 1
+    ) -> Dict[str, List[Dict]]:
+        """
+        Serve several analytics calls with one cache read and one cache write.
+
+        Args:
+            requests: List of {id, api, type, filters} where api is one of
+                'grouped', 'top' or 'performance' and type is the
+                object_type/top_type ('performance' takes none)
+            max_workers: Compute cache misses on up to this many threads
+
+        Returns:
+            Dict of {id: result}, each result identical to the matching
+            get_*_analytics call (and sharing its cache entry)
+        """
+        cache_keys = {}
+        for req in requests:
+            prefix = cls._BUNDLE_APIS[req["api"]][0]
+            key_kwargs = {"filters": req.get("filters", {})}
+            if req["api"] != "performance":
+                key_kwargs["type"] = req["type"]
+            cache_keys[req["id"]] = cls._generate_cache_key(prefix, **key_kwargs)
+
+        hits = cache.get_many(list(cache_keys.values()))
+
+        # cache_key -> (compute method, args); identical requests share one
+        pending = {}
+        for req in requests:
+            cache_key = cache_keys[req["id"]]
+            if cache_key in hits or cache_key in pending:
+                continue
+            compute = getattr(cls, cls._BUNDLE_APIS[req["api"]][1])
+            args = [req.get("filters", {})]
+            if req["api"] != "performance":
+                args.insert(0, req["type"])
+            pending[cache_key] = (compute, args)
+
+        # Worker threads get their own DB connections, which cannot see rows
+        # written in the caller's open transaction: stay serial inside one.
+        if max_workers > 1 and len(pending) > 1 and not connection.in_atomic_block:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+                futures = {
+                    cache_key: pool.submit(cls._compute_in_thread, compute, args)
+                    for cache_key, (compute, args) in pending.items()
+                }
+            misses = {cache_key: future.result() for cache_key, future in futures.items()}
+        else:
+            misses = {
+                cache_key: compute(*args)
+                for cache_key, (compute, args) in pending.items()
+            }
+
+        if misses:
+            cache.set_many(misses, timeout=cls.CACHE_TIMEOUT)
+
+        found = {**hits, **misses}
+        return {req["id"]: found[cache_keys[req["id"]]] for req in requests}
+
+    @staticmethod
+    def _compute_in_thread(compute, args):
+        """Run a compute method on a worker thread and close its DB connections."""
+        try:
+            return compute(*args)
+        finally:
+            connections.close_all()
+
+    @classmethod
+    def dashboard(cls, filters: Dict) -> Dict[str, List[Dict]]:
+        """
+        The common dashboard set (grouped by country and by user, top blogs,
+        performance) for one filter set.
+
+        One cache round-trip for all four; misses are computed concurrently.
+
+        Returns:
+            Dict with keys grouped_country, grouped_user, top_blog, performance
+        """
+        return cls.get_bundle(
+            [
+                {"id": "grouped_country", "api": "grouped", "type": "country", "filters": filters},
+                {"id": "grouped_user", "api": "grouped", "type": "user", "filters": filters},
+                {"id": "top_blog", "api": "top", "type": "blog", "filters": filters},
+                {"id": "performance", "api": "performance", "filters": filters},
+            ],
+            max_workers=4,
+        )
 
     @classmethod
     def _calculate_growth_periods(cls, raw_data) -> List[Dict]:
@@ -322,26 +489,34 @@ class AnalyticsService:
         Returns:
             List of {x: "date (N blogs)", y: views, z: growth_percent}
         """
-        results = []
-        prev_views = 0
-
-        for entry in raw_data:
-            views = entry["views"]
-            # Calculate growth: ((current - previous) / previous) * 100
-            growth = (
-                ((views - prev_views) / prev_views * 100) if prev_views > 0 else 0.0
+        rows = list(raw_data)
+        views = [entry["views"] for entry in rows]
+
+        return [
+            {
+                # isoformat()[:10] == strftime('%Y-%m-%d') for dates and
+                # datetimes, without strftime's format parsing per row
+                "x": f"{entry['period'].isoformat()[:10]} ({entry['blogs']} blogs)",
+                "y": period_views,
+                "z": growth,
+            }
+            for entry, period_views, growth in zip(
+                rows, views, cls._growth_percentages(views)
             )
+        ]
 
-            results.append(
-                {
-                    "x": f"{entry['period'].strftime('%Y-%m-%d')} ({entry['blogs']} blogs)",
-                    "y": views,
-                    "z": round(growth, 2),
-                }
-            )
-            prev_views = views
+    @staticmethod
+    def _growth_percentages(views: List[int]) -> List[float]:
+        """
+        Period-over-period growth for a views series ordered by period.
 
-        return results
+        growth = ((current - previous) / previous) * 100, rounded to 2 places;
+        0.0 for the first period and whenever the previous period had no views.
+        """
+        return [
+            round((current - prev) / prev * 100, 2) if prev > 0 else 0.0
+            for prev, current in zip([0, *views[:-1]], views)
+        ]
 
     @classmethod
     def _build_summary_filters(cls, filters: Dict) -> Q:
@@ -353,37 +528,124 @@ class AnalyticsService:
         that leverages the pre-calculated data structure. This eliminates
         the need for complex filtering logic at query time.
         """
-        q_objects = Q()
+        return _build_q(
+            _freeze_filters(filters), "date", SUMMARY_FILTER_MAP, dates_only=True
+        )
 
-        # Date filters (mutually exclusive: year OR date range)
-        if year := filters.get("year"):
-            q_objects &= Q(date__year=year)
-        else:
-            # Handle both datetime and date objects
-            if start_date := filters.get("start_date"):
-                start_date_value = (
-                    start_date.date()
-                    if isinstance(start_date, datetime)
-                    else start_date
-                )
-                q_objects &= Q(date__gte=start_date_value)
-            if end_date := filters.get("end_date"):
-                end_date_value = (
-                    end_date.date() if isinstance(end_date, datetime) else end_date
-                )
-                q_objects &= Q(date__lte=end_date_value)
+    # Per-backend SQL computing (group, total views, distinct blog ids) over
+    # the summary rows query {sql}, whose columns are (x, views, ids). Only
+    # one row per group leaves the database.
+    _GROUP_TOTALS_SQL: ClassVar[Dict[str, str]] = {
+        # One GROUP BY over the summaries: each group's arrays are collected
+        # with jsonb_agg and de-duplicated in a scalar subquery.
+        "postgresql": (
+            "SELECT s.x, SUM(s.views), ("
+            "SELECT COUNT(DISTINCT b.id::int) "
+            "FROM jsonb_array_elements("
+            "jsonb_agg(s.ids) FILTER (WHERE s.ids IS NOT NULL)"
+            ") AS d(ids) "
+            "CROSS JOIN LATERAL jsonb_array_elements_text(d.ids) AS b(id)"
+            ") FROM ({sql}) AS s(x, views, ids) "
+            "GROUP BY s.x"
+        ),
+        # json_each expands each list in the same pass; a summary's views are
+        # counted once, on its first element (or its only row when the list
+        # is empty or NULL).
+        "sqlite": (
+            "WITH s(x, views, ids) AS ({sql}) "
+            "SELECT s.x, "
+            "SUM(CASE WHEN j.key IS NULL OR j.key = 0 THEN s.views ELSE 0 END), "
+            "COUNT(DISTINCT j.value) "
+            "FROM s LEFT JOIN json_each(s.ids) AS j "
+            "GROUP BY s.x"
+        ),
+    }
 
-        # Country filters
-        if country_codes := filters.get("country_codes"):
-            q_objects &= Q(country__code__in=country_codes)
-        if exclude_codes := filters.get("exclude_country_codes"):
-            q_objects &= ~Q(country__code__in=exclude_codes)
+    @classmethod
+    def _summary_group_totals(cls, summaries, group_field: str) -> Dict:
+        """
+        Sum total_views and count distinct blog_ids per group in one scan.
 
-        # Author filter
-        if author := filters.get("author_username"):
-            q_objects &= Q(author__username=author)
+        On PostgreSQL and SQLite the JSON lists are expanded and de-duplicated
+        in the database (see _GROUP_TOTALS_SQL); other backends union the
+        lists in Python.
 
-        return q_objects
+        Returns:
+            Dict of {group_value: (total_views, distinct_blog_count)}
+        """
+        rows = summaries.order_by().values_list(group_field, "total_views", "blog_ids")
+
+        if template := cls._GROUP_TOTALS_SQL.get(connection.vendor):
+            sql, params = rows.query.sql_with_params()
+            with connection.cursor() as cur:
+                cur.execute(template.format(sql=sql), params)
+                return {x: (views, blogs) for x, views, blogs in cur.fetchall()}
+
+        # Stream the rows (server-side cursor where supported) so only the
+        # per-group sets, not every blog_ids list, are held in memory. Only
+        # backends without a _GROUP_TOTALS_SQL entry get here, so plain sets
+        # are preferred over pulling in numpy for np.unique.
+        views_map: Dict[Any, int] = {}
+        union_map: Dict[Any, Set[int]] = {}
+        for key, total_views, blog_ids in rows.iterator(chunk_size=2000):
+            views_map[key] = views_map.get(key, 0) + total_views
+            union_map.setdefault(key, set()).update(blog_ids or [])
+        return {key: (views_map[key], len(union_map[key])) for key in views_map}
+
+    @classmethod
+    def _hll_distinct_counts(
+        cls, redis_conn, summaries, group_field: str, groups: List
+    ) -> Dict:
+        """
+        Approximate distinct blogs per group from the precalc HLL keys.
+
+        Keys follow precalc: analytics:hll:{date}:{country_id or all}:{author_id or all}.
+        Groups whose PFCOUNT fails or returns 0 are left out so the caller
+        can fall back to the exact union for them: every group comes from
+        summaries with views, so 0 means the keys are missing (expired after
+        90 days, or the days were precalculated before HLL was enabled).
+        """
+        # Only the groups from the totals query are looked up, so a summary
+        # committed in between cannot introduce an unknown group.
+        group_hll_keys: Dict[Any, List[str]] = {group: [] for group in groups}
+        rows = (
+            summaries.filter(**{f"{group_field}__in": groups})
+            .order_by()
+            .values_list(group_field, "date", "country_id", "author_id")
+        )
+        for gv, date_val, country_id, author_id in rows:
+            keys = group_hll_keys.get(gv)
+            if keys is not None:
+                keys.append(
+                    f"analytics:hll:{date_val.isoformat()}:{country_id or 'all'}:{author_id or 'all'}"
+                )
+
+        # One PFCOUNT per group (PFCOUNT over several keys returns the
+        # approximate size of their union), all sent in a single
+        # pipelined round-trip. Per-command errors come back as results.
+        queried = [group for group in groups if group_hll_keys[group]]
+        if not queried:
+            return {}
+        try:
+            with redis_conn.pipeline(transaction=False) as pipe:
+                for group in queried:
+                    pipe.pfcount(*group_hll_keys[group])
+                counts = pipe.execute(raise_on_error=False)
+        except Exception:
+            logger.exception("Redis PFCOUNT pipeline failed; using exact union")
+            return {}
+
+        distinct = {}
+        for group, approx in zip(queried, counts):
+            if isinstance(approx, Exception):
+                logger.error(
+                    "Redis PFCOUNT failed; falling back to exact union for group %s: %s",
+                    group,
+                    approx,
+                )
+            elif approx:
+                distinct[group] = int(approx)
+        return distinct
 
     @classmethod
     def get_grouped_analytics_fast(cls, object_type: str, filters: Dict) -> List[Dict]:
@@ -404,11 +666,77 @@ class AnalyticsService:
             "grouped_fast", type=object_type, filters=filters
         )
 
-        if cached := cache.get(cache_key):
+        # Compare against None so cached empty results count as hits too
+        if (cached := cache.get(cache_key)) is not None:
             return cached
 
-        # Check if pre-calculated data exists
-        if not DailyAnalyticsSummary.objects.exists():
+        # Build declarative query - no complex conditional logic
+        query_filters = cls._build_summary_filters(filters)
+        if object_type == "country":
+            group_field, null_field = "country__code", "country"
+        else:
+            # Username is denormalized onto the summary: no auth_user join
+            group_field, null_field = "author_username", "author"
+
+        # Filter out null values to avoid grouping issues
+        # When grouping by country, exclude null countries
+        # When grouping by author, exclude null authors
+        # (combined into the one Q so the queryset gets a single filter()).
+        # The cached filters Q is not mutated: & builds a new Q.
+        query_filters &= Q(**{f"{null_field}__isnull": False})
+        summaries = DailyAnalyticsSummary.objects.filter(query_filters)
+
+        # If HLL is enabled and Redis is available, y is the approximate
+        # PFCOUNT across the per-day HLL keys, so the exact union is skipped
+        # and only the views are summed.
+        redis_conn = None
+        if getattr(settings, "IDEEZA_USE_HLL", False):
+            try:
+                redis_conn = get_redis_connection()
+            except Exception:
+                redis_conn = None
+            if not redis_conn:
+                logger.info("IDEEZA_USE_HLL=True but no Redis client available; using exact union")
+
+        if redis_conn:
+            views_map = dict(
+                summaries.order_by()
+                .values(group_field)
+                .annotate(views=Sum("total_views"))
+                .values_list(group_field, "views")
+            )
+            distinct = cls._hll_distinct_counts(
+                redis_conn, summaries, group_field, list(views_map)
+            )
+            # Groups whose PFCOUNT failed fall back to the exact union
+            if missing := [key for key in views_map if key not in distinct]:
+                exact = cls._summary_group_totals(
+                    summaries.filter(**{f"{group_field}__in": missing}), group_field
+                )
+                distinct.update((key, blogs) for key, (_, blogs) in exact.items())
+            totals = {
+                key: (views, distinct.get(key, 0)) for key, views in views_map.items()
+            }
+        else:
+            # NOTE: `unique_blogs` is a per-day distinct count. Summing it gives
+            # "blog-days" (a blog seen on 3 days counts 3) which is incorrect
+            # when we want the number of distinct blogs across the whole range.
+            # The exact `y` is the size of the union of the per-day blog_ids,
+            # computed in the same pass that sums the views.
+            totals = cls._summary_group_totals(summaries, group_field)
+
+        data = sorted(
+            (
+                {"x": key, "y": blogs, "z": views}
+                for key, (views, blogs) in totals.items()
+            ),
+            key=lambda entry: entry["z"],
+            reverse=True,
+        )
+
+        # An unfiltered empty result means the summaries have not been
+        # built yet; don't cache it so data shows up as soon as they are.
+        if not data and not filters:
             logger.warning(
                 "No pre-calculated summaries found. "
                 "Run 'python manage.py precalculate_stats' first. "
@@ -416,192 +744,294 @@ class AnalyticsService:
             )
             return []
 
-        # Build declarative query - no complex conditional logic
-        query_filters = cls._build_summary_filters(filters)
-        group_field = (
-            "country__code" if object_type == "country" else "author__username"
+        cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
+        return data
+
+
+# ---------------------------------------------------------------------------
+# Daily pre-calculation (DailyAnalyticsSummary + optional HLL mirror)
+# ---------------------------------------------------------------------------
+
+# Rows fetched per round-trip while streaming aggregates, and summaries
+# written per INSERT ... ON CONFLICT batch.
+ITERATOR_CHUNK_SIZE = 5000
+UPSERT_BATCH_SIZE = 1000
+HLL_PIPELINE_BATCH = 500
+
+
+def _day_start(start_date):
+    """
+    Aware datetime for local midnight of start_date.
+
+    Filtering on a plain range over timestamp (rather than
+    timestamp__date) keeps the timestamp btree indexes usable.
+    """
+    return timezone.make_aware(datetime.combine(start_date, dt_time.min))
+
+
+def _backfill_view_authors(start_date):
+    """
+    Fill BlogView.author from the blog where it is still NULL.
+
+    The denormalized author is only set by BlogView.save(), so rows written
+    with bulk_create or raw SQL arrive without it. NULL never conflicts on
+    the (date, country, author) unique constraint, so those views would be
+    summarised into a fresh duplicate row on every run.
+    """
+    return BlogView.objects.filter(
+        timestamp__gte=_day_start(start_date), author__isnull=True
+    ).update(
+        author_id=Subquery(
+            Blog.objects.filter(pk=OuterRef("blog_id")).values("author_id")[:1]
         )
+    )
 
-        # Filter out null values to avoid grouping issues
-        # When grouping by country, exclude null countries
-        # When grouping by author, exclude null authors
-        null_filter = {f"{group_field}__isnull": False}
-
-        # Simple aggregation on pre-calculated data
-        data = list(
-            DailyAnalyticsSummary.objects.filter(query_filters)
-            .filter(**null_filter)
-            .values(x=F(group_field))
-            .annotate(y=Sum("unique_blogs"), z=Sum("total_views"))
-            .order_by("-z")
+
+def _aggregate_views(start_date):
+    """
+    Stream BlogView aggregates per (day, country, author) from one query.
+
+    Yields dicts carrying total_views, unique_blogs and the distinct
+    blog_ids. Postgres builds the id list with ARRAY_AGG(DISTINCT ...);
+    other backends group one level finer (per blog) and roll up in
+    Python. Rows are fetched in chunks so memory stays O(chunk), not
+    O(all groups).
+    """
+    base_qs = BlogView.objects.filter(timestamp__gte=_day_start(start_date)).annotate(
+        view_date=TruncDate("timestamp")
+    )
+
+    if connection.vendor == "postgresql":
+        yield from (
+            base_qs.values("view_date", "country", "author", "author__username")
+            .annotate(
+                total_views=Count("id"),
+                unique_blogs=Count("blog", distinct=True),
+                blog_ids=ArrayAgg("blog", distinct=True),
+            )
+            # Consumers don't need the groups sorted; clear any ordering
+            # (including Meta.ordering) so Postgres skips the sort step.
+            .order_by()
+            .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
         )
+        return
+
+    # Ordered by the full group key (the one sort this path needs) so
+    # each group's rows are contiguous and can be emitted as soon as the
+    # key changes. The raw *_id columns keep Country's Meta.ordering (and
+    # its JOIN) out of the ORDER BY/GROUP BY.
+    per_blog = (
+        base_qs.values("view_date", "country", "author", "author__username", "blog")
+        .annotate(views=Count("id"))
+        .order_by("view_date", "country_id", "author_id")
+    )
+
+    entry = None
+    for row in per_blog.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        key = (row["view_date"], row["country"], row["author"])
+        if entry is None or key != (
+            entry["view_date"],
+            entry["country"],
+            entry["author"],
+        ):
+            if entry is not None:
+                yield entry
+            entry = {
+                "view_date": row["view_date"],
+                "country": row["country"],
+                "author": row["author"],
+                "author__username": row["author__username"],
+                "total_views": 0,
+                "unique_blogs": 0,
+                "blog_ids": [],
+            }
+        entry["total_views"] += row["views"]
+        entry["unique_blogs"] += 1
+        entry["blog_ids"].append(row["blog"])
+
+    if entry is not None:
+        yield entry
+
+
+def _upsert_summaries_orm(start_date):
+    """Aggregate in the ORM and upsert via bulk_create (portable path)."""
+    # Existing rows are updated in place by the database
+    # (INSERT ... ON CONFLICT DO UPDATE), so we never load the current
+    # summaries; new ones are flushed in fixed-size batches.
+    upserted = 0
+    batch = []
+    for row in _aggregate_views(start_date):
+        batch.append(
+            DailyAnalyticsSummary(
+                date=row["view_date"],
+                country_id=row["country"],
+                author_id=row["author"],
+                author_username=row["author__username"] or "",
+                total_views=row["total_views"],
+                unique_blogs=row["unique_blogs"],
+                blog_ids=row["blog_ids"],
+            )
+        )
+        if len(batch) >= UPSERT_BATCH_SIZE:
+            upserted += _flush_summaries(batch)
+            batch = []
+    if batch:
+        upserted += _flush_summaries(batch)
+    return upserted
+
+
+def _flush_summaries(batch):
+    DailyAnalyticsSummary.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["date", "country", "author"],
+        update_fields=[
+            "author_username",
+            "total_views",
+            "unique_blogs",
+            "blog_ids",
+        ],
+    )
+    return len(batch)
+
+
+def _upsert_summaries_sql(start_date):
+    """
+    Aggregate and upsert entirely inside Postgres.
 
-        # NOTE: `unique_blogs` is a per-day distinct count. Summing it gives
-        # "blog-days" (a blog seen on 3 days counts 3) which is incorrect
-        # when we want the number of distinct blogs across the whole range.
-        # To return an accurate `y` (distinct blogs across the period) we
-        # query the raw `BlogView` table for distinct blog counts per group
-        # and merge that result into `data`.
-        if data:
-            # Determine BlogView grouping field mapping (not needed when using blog_ids)
-
-            # Prefer to compute deduplicated unique blog counts from
-            # pre-calculated DailyAnalyticsSummary.blog_ids (exact) to avoid
-            # touching the raw BlogView table.
-            group_keys = [d["x"] for d in data]
-
-            if group_keys:
-                # Load all summary rows for the groups and build a union of blog_ids per group
-                # If HLL is enabled, we should use an approximate counting
-                # implementation (e.g. Postgres hll extension or Redis PFCOUNT).
-                # At this time the toggle exists but an HLL backend is not
-                # wired; fall back to exact union and log the fallback.
-                if getattr(settings, "IDEEZA_USE_HLL", False):
-                    # Try Redis PFCOUNT-based union if available
-                    try:
-                        redis_conn = get_redis_connection()
-                    except Exception:
-                        redis_conn = None
-
-                    if redis_conn:
-                        # Build hll keys for periods present in summaries
-                        # Keys must match the format used by precalc: analytics:hll:{date}:{country_id or all}:{author_id or all}
-                        hll_keys = []
-                        for d in DailyAnalyticsSummary.objects.filter(query_filters).filter(**null_filter).filter(**{f"{group_field}__in": group_keys}).values_list("date", "country_id", "author_id"):
-                            date_val, country_id, author_id = d
-                            key = f"analytics:hll:{date_val.isoformat()}:{country_id or 'all'}:{author_id or 'all'}"
-                            hll_keys.append(key)
-
-                        try:
-                            if hll_keys:
-                                # PFCOUNT accepts multiple keys and returns approximate union size
-                                # Use PFCOUNT on a per-group basis: for each group key compute union across dates
-                                union_map = {}
-                                for group in group_keys:
-                                    # Build keys filtered by group (group is x which equals country code or author username)
-                                    # We need to map group to country_id/author_id; since we only have values we fall back to exact method below
-                                    union_map[group] = set()
-
-                                # Fallback to exact method for now (keeps correctness), but we attempted Redis access above
-                                logger.info("Redis HLL available but precise group key mapping not implemented; falling back to exact union for correctness")
-                            else:
-                                union_map = {}
-                        except Exception:
-                            logger.exception("Error using Redis HLL; falling back to exact union")
-                            union_map = {}
-                    else:
-                        logger.info(
-                            "IDEEZA_USE_HLL is True but no Redis client available; falling back to exact counting."
-                        )
-
-                # If HLL is enabled and Redis is available, use PFCOUNT across
-                # the per-day HLL keys for an approximate distinct count. We
-                # build the same keys that precalc writes: analytics:hll:{date}:{country_id or all}:{author_id or all}
-                if getattr(settings, "IDEEZA_USE_HLL", False):
-                    try:
-                        redis_conn = get_redis_connection()
-                    except Exception:
-                        redis_conn = None
-
-                    if redis_conn:
-                        # Build mapping: group_value -> list of HLL keys
-                        group_hll_keys = {g: [] for g in group_keys}
-
-                        # Query the existing summaries for the filtered range and groups
-                        rows = (
-                            DailyAnalyticsSummary.objects.filter(query_filters)
-                            .filter(**null_filter)
-                            .filter(**{f"{group_field}__in": group_keys})
-                            .values(group_field, "date", "country_id", "author_id")
-                        )
-
-                        for r in rows:
-                            gv = r[group_field]
-                            date_val = r["date"]
-                            country_id = r.get("country_id")
-                            author_id = r.get("author_id")
-                            key = f"analytics:hll:{date_val.isoformat()}:{country_id or 'all'}:{author_id or 'all'}"
-                            group_hll_keys[gv].append(key)
-
-                        # For each group, call PFCOUNT on the group's keys to get approximate distinct count
-                        for entry in data:
-                            g = entry["x"]
-                            keys = group_hll_keys.get(g) or []
-                            if keys:
-                                try:
-                                    # PFCOUNT accepts multiple keys
-                                    approx = redis_conn.pfcount(*keys)
-                                    entry["y"] = int(approx)
-                                except Exception:
-                                    logger.exception("Redis PFCOUNT failed; falling back to exact union for group %s", g)
-                                    entry["y"] = 0
-                            else:
-                                entry["y"] = 0
-
-                        # For any groups where HLL failed or wasn't available, fall back to exact union
-                        remaining = [e for e in data if e["y"] == 0]
-                        if remaining:
-                            # exact union method
-                            raw_rows = (
-                                DailyAnalyticsSummary.objects.filter(query_filters)
-                                .filter(**null_filter)
-                                .filter(**{f"{group_field}__in": group_keys})
-                                .values(group_field, "blog_ids")
-                            )
-
-                            union_map = {}
-                            for r in raw_rows:
-                                key = r[group_field]
-                                blog_ids = r.get("blog_ids") or []
-                                if key not in union_map:
-                                    union_map[key] = set()
-                                union_map[key].update(blog_ids)
-
-                            for entry in data:
-                                if entry["y"] == 0:
-                                    entry["y"] = len(union_map.get(entry["x"], set()))
-                    else:
-                        logger.info("IDEEZA_USE_HLL=True but no Redis client available; using exact union")
-                        raw_rows = (
-                            DailyAnalyticsSummary.objects.filter(query_filters)
-                            .filter(**null_filter)
-                            .filter(**{f"{group_field}__in": group_keys})
-                            .values(group_field, "blog_ids")
-                        )
-
-                        union_map = {}
-                        for r in raw_rows:
-                            key = r[group_field]
-                            blog_ids = r.get("blog_ids") or []
-                            if key not in union_map:
-                                union_map[key] = set()
-                            union_map[key].update(blog_ids)
-
-                        for entry in data:
-                            entry["y"] = len(union_map.get(entry["x"], set()))
-                else:
-                    # HLL not enabled; exact union
-                    raw_rows = (
-                        DailyAnalyticsSummary.objects.filter(query_filters)
-                        .filter(**null_filter)
-                        .filter(**{f"{group_field}__in": group_keys})
-                        .values(group_field, "blog_ids")
-                    )
-
-                    union_map = {}
-                    for r in raw_rows:
-                        key = r[group_field]
-                        blog_ids = r.get("blog_ids") or []
-                        if key not in union_map:
-                            union_map[key] = set()
-                        union_map[key].update(blog_ids)
-
-                    for entry in data:
-                        entry["y"] = len(union_map.get(entry["x"], set()))
-            else:
-                # No groups found - keep y/z defaults
-                for entry in data:
-                    entry["y"] = 0
+    A single INSERT ... SELECT ... ON CONFLICT statement, so the grouped
+    rows never cross the database boundary. Day bucketing matches
+    TruncDate in the current time zone.
+    """
+    sql = f"""
+        INSERT INTO {DailyAnalyticsSummary._meta.db_table}
+            (date, country_id, author_id, author_username,
+             total_views, unique_blogs, blog_ids)
+        SELECT
+            (v.timestamp AT TIME ZONE %s)::date,
+            v.country_id,
+            v.author_id,
+            COALESCE(u.username, ''),
+            COUNT(*),
+            COUNT(DISTINCT v.blog_id),
+            to_jsonb(array_agg(DISTINCT v.blog_id))
+        FROM {BlogView._meta.db_table} v
+        LEFT JOIN {User._meta.db_table} u ON u.id = v.author_id
+        WHERE v.timestamp >= %s
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (date, country_id, author_id) DO UPDATE SET
+            author_username = EXCLUDED.author_username,
+            total_views = EXCLUDED.total_views,
+            unique_blogs = EXCLUDED.unique_blogs,
+            blog_ids = EXCLUDED.blog_ids
+    """
+    tzname = timezone.get_current_timezone_name()
+    with connection.cursor() as cur:
+        cur.execute(sql, [tzname, _day_start(start_date)])
+        return cur.rowcount
+
+
+def _execute_hll_pipeline(pipe, pending):
+    """Flush queued HLL writes; a failed batch is logged, not fatal."""
+    try:
+        pipe.execute()
+    except Exception:
+        logger.exception("Failed to flush %d HLL updates", pending)
+        pipe.reset()
+
+
+def _write_hll_keys(start_date):
+    """Mirror each summary's blog_ids into a per-day Redis HyperLogLog."""
+    try:
+        redis_conn = get_redis_connection()
+    except Exception:
+        redis_conn = None
+
+    if not redis_conn:
+        logger.info("IDEEZA_USE_HLL=True but no Redis client available; skipping HLL writes")
+        return
+
+    # For each upserted summary, update the HLL structure. The
+    # summaries are read back so both upsert paths feed the same loop.
+    # Key format: analytics:hll:{date}:{country_id or all}:{author_id or all}
+    # Streamed with no ORDER BY: Meta.ordering would otherwise
+    # join Country and sort every summary just to iterate them.
+    upserted_rows = (
+        DailyAnalyticsSummary.objects.filter(date__gte=start_date)
+        .order_by()
+        .values_list("date", "country_id", "author_id", "blog_ids")
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    # PFADD/EXPIRE pairs are pipelined (no MULTI) and flushed every
+    # HLL_PIPELINE_BATCH summaries instead of two round-trips each.
+    pending = 0
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for date_val, country_id, author_id, blog_ids in upserted_rows:
+            if not blog_ids:
+                continue
+            key = f"analytics:hll:{date_val.isoformat()}:{country_id or 'all'}:{author_id or 'all'}"
+            # blog_ids can be large; PFADD accepts multiple values.
+            # Convert ints to strings for redis.
+            pipe.pfadd(key, *map(str, blog_ids))
+            # Set an expiry of 90 days to avoid indefinite growth
+            pipe.expire(key, 60 * 60 * 24 * 90)
+            pending += 1
+            if pending >= HLL_PIPELINE_BATCH:
+                _execute_hll_pipeline(pipe, pending)
+                pending = 0
+        if pending:
+            _execute_hll_pipeline(pipe, pending)
+
+
+def precalc_start_date(days=None):
+    """
+    First day a pre-calculation run covers.
 
-        cache.set(cache_key, data, timeout=cls.CACHE_TIMEOUT)
-        return data
+    The last `days` days when given, otherwise the day of the earliest
+    BlogView; None when there are no views at all.
+    """
+    if days:
+        return timezone.now().date() - timedelta(days=days)
+    earliest = BlogView.objects.order_by("timestamp").first()
+    return earliest.timestamp.date() if earliest else None
+
+
+def precalculate_stats(start_date=None, dry_run=False) -> int:
+    """
+    Rebuild DailyAnalyticsSummary rows from start_date (default: all data).
+
+    The core of `manage.py precalculate_stats` without the run lock,
+    console output or metrics, so tests and other callers can invoke it
+    directly. Returns the number of summaries upserted (or that would be,
+    with dry_run).
+    """
+    if start_date is None:
+        start_date = precalc_start_date()
+        if start_date is None:
+            return 0
+
+    if dry_run:
+        return sum(1 for _ in _aggregate_views(start_date))
+
+    # Apply in a transaction for atomicity
+    with transaction.atomic():
+        _backfill_view_authors(start_date)
+        # NULLs never conflict on a unique constraint, so rows for
+        # views without a country would be duplicated by the upsert.
+        # Drop them first and let the insert recreate them. Every view now
+        # has an author, so author-less rows are stale (left by earlier runs
+        # or by a deleted author) and go too.
+        DailyAnalyticsSummary.objects.filter(
+            Q(country__isnull=True) | Q(author__isnull=True),
+            date__gte=start_date,
+        ).delete()
+        if connection.vendor == "postgresql":
+            upserted = _upsert_summaries_sql(start_date)
+        else:
+            upserted = _upsert_summaries_orm(start_date)
+
+    # If HLL integration is enabled and redis is available, write HLL keys
+    if getattr(settings, "IDEEZA_USE_HLL", False):
+        _write_hll_keys(start_date)
+
+    return upserted
@@ -0,0 +1,25 @@
+# src/analytics/test_utils.py
+"""Fixtures shared by the analytics test modules."""
+
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.models import Country
+
+
+class BaseAnalyticsFixture(TestCase):
+    """
+    Author, US country and reference time shared by the analytics test
+    classes. Created once per class; each test rolls back to this state.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Fixed reference time for tests that back-date rows, so day
+        # bucketing doesn't depend on when the suite runs
+        cls.NOW = timezone.make_aware(datetime(2025, 1, 15, 12))
+        cls.user = User.objects.create_user("testuser", "test@example.com")
+        cls.country_us = Country.objects.create(name="USA", code="US")
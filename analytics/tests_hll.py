@@ -0,0 +1,143 @@
+# src/analytics/tests_hll.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from analytics.models import Blog, BlogView
+from analytics.services import AnalyticsService, precalculate_stats
+from analytics.test_utils import BaseAnalyticsFixture
+
+
+class FakeRedis:
+    """
+    Just enough of a redis client for the HLL paths.
+
+    pipeline() hands back the client itself: commands are queued and
+    answered by execute(). PFCOUNT replies with pfcount_ret, or execute()
+    raises pfcount_exc when a PFCOUNT is queued. PFADD and PFCOUNT
+    arguments are recorded for assertions.
+    """
+
+    def __init__(self, pfcount_ret=None, pfcount_exc=None):
+        self.pfadd_calls = []
+        self.pfcount_calls = []
+        self._ret, self._exc = pfcount_ret, pfcount_exc
+        self._queued = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.reset()
+
+    def pfadd(self, key, *values):
+        self.pfadd_calls.append((key, values))
+        self._queued.append(1)
+
+    def expire(self, key, seconds):
+        self._queued.append(True)
+
+    def pfcount(self, *keys):
+        self.pfcount_calls.append(keys)
+        self._queued.append(self._ret)
+
+    def execute(self, raise_on_error=True):
+        queued, self._queued = self._queued, []
+        if self._exc is not None and self.pfcount_calls:
+            raise self._exc
+        return queued
+
+    def reset(self):
+        self._queued = []
+
+
+# HLL is enabled once for the whole class. Results are cached per filter
+# set; a no-op cache keeps every test cold without clearing anything.
+@override_settings(
+    IDEEZA_USE_HLL=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+)
+class HLLRedisTests(BaseAnalyticsFixture):
+    """Opt-in Redis HLL path (IDEEZA_USE_HLL) against a fake Redis client."""
+
+    def _create_views_two_days(self):
+        """Two blogs viewed over two days: 2 distinct blogs, 3 views."""
+        day1 = self.NOW - timedelta(days=2)
+        day2 = self.NOW - timedelta(days=1)
+
+        # bulk_create stamps auto_now_add fields itself, so the back-dated
+        # times are applied with one UPDATE per timestamp afterwards
+        b1, b2 = Blog.objects.bulk_create(
+            [
+                Blog(title="HLL A", author=self.user, content="A"),
+                Blog(title="HLL B", author=self.user, content="B"),
+            ]
+        )
+        Blog.objects.filter(pk__in=[b1.pk, b2.pk]).update(created_at=day1)
+
+        # bulk_create skips BlogView.save(), so set the denormalized author
+        bv1, bv2, bv3 = BlogView.objects.bulk_create(
+            [
+                BlogView(blog=b1, author=self.user, country=self.country_us),
+                BlogView(blog=b2, author=self.user, country=self.country_us),
+                BlogView(blog=b1, author=self.user, country=self.country_us),
+            ]
+        )
+        BlogView.objects.filter(pk__in=[bv1.pk, bv2.pk]).update(timestamp=day1)
+        BlogView.objects.filter(pk=bv3.pk).update(timestamp=day2)
+
+    def test_hll_read_path(self):
+        """
+        With HLL enabled, y comes from a single pipelined PFCOUNT per group;
+        a failing or zero PFCOUNT keeps the exact distinct count from blog_ids.
+        """
+        # Fixtures and precalc are shared; only PFCOUNT's behaviour varies
+        self._create_views_two_days()
+        writer = FakeRedis()
+        with patch("analytics.services.get_redis_connection", return_value=writer):
+            precalculate_stats()
+        # One PFADD per day/country/author summary
+        self.assertEqual(len(writer.pfadd_calls), 2)
+
+        # (redis client, expected y, exact unions computed)
+        cases = {
+            "pfcount": (FakeRedis(pfcount_ret=123), 123, 0),
+            "pfcount_failure": (
+                FakeRedis(pfcount_exc=Exception("redis down")),
+                2,
+                1,
+            ),
+            # Expired or never-written keys count as 0: not a real answer
+            "pfcount_zero": (FakeRedis(pfcount_ret=0), 2, 1),
+        }
+        for case, (redis_conn, expected_y, exact_calls) in cases.items():
+            with self.subTest(case=case):
+                with patch(
+                    "analytics.services.get_redis_connection", return_value=redis_conn
+                ), patch.object(
+                    AnalyticsService,
+                    "_summary_group_totals",
+                    wraps=AnalyticsService._summary_group_totals,
+                ) as exact_union:
+                    result = AnalyticsService.get_grouped_analytics_fast("country", {})
+
+                # The exact union only runs for groups PFCOUNT couldn't answer
+                self.assertEqual(exact_union.call_count, exact_calls)
+                self.assertEqual(len(redis_conn.pfcount_calls), 1)
+                # one key per day
+                self.assertEqual(len(redis_conn.pfcount_calls[0]), 2)
+                self.assertEqual(result, [{"x": "US", "y": expected_y, "z": 3}])
+
+    @override_settings(IDEEZA_USE_HLL=False)
+    def test_precalc_skips_redis_when_hll_disabled(self):
+        """With HLL off, precalc never asks for a Redis connection."""
+        self._create_views_two_days()
+
+        with patch("analytics.services.get_redis_connection") as get_conn:
+            self.assertEqual(precalculate_stats(), 2)
+
+        get_conn.assert_not_called()